@@ -1,7 +1,7 @@
 C Calculate the overlap integral of an AC mode with itself using
 C Direct integration
 C
-      subroutine AC_alpha_int_v2 (nval, 
+      recursive subroutine AC_alpha_int_v2 (nval, 
      *  nel, npt, nnodes, table_nod, type_el, x,
      *  nb_typ_el, eta_tensor, beta_AC, Omega_AC, soln_AC,
      *  AC_mode_energy_elastic, overlap)
@@ -56,6 +56,9 @@ Cf2py depend(AC_mode_energy_elastic) nval
 C
 Cf2py intent(out) overlap
 C
+C Release the GIL while integrating (re-entrant, as declared recursive)
+Cf2py threadsafe
+C
 C
 CCCCCCCCCCCCCCCCCCCCC Start Program CCCCCCCCCCCCCCCCCCCCCCCC
 C
@@ -0,0 +1,340 @@
+C Calculate the acoustic loss (alpha) of each AC mode and the
+C photoelastic overlap of two EM modes and an AC mode in a single pass
+C over the mesh, using analytic expressions for basis function overlaps
+C on linear elements.
+C Equivalent to calling AC_alpha_int_v2 and photoelastic_int_v2, but the
+C element geometry and AC fields are only loaded once per element.
+C
+      recursive subroutine AC_alpha_photoelastic_int_v2 (nval_EM_p,
+     *  nval_EM_S, nval_AC, ival1, ival2, ival3, nel, npt, nnodes,
+     *  table_nod, type_el, x, nb_typ_el, p_tensor, eta_tensor, beta_AC,
+     *  Omega_AC, soln_EM_p, soln_EM_S, soln_AC, nel_EM, el_convert_tbl,
+     *  AC_mode_energy_elastic, eps_lst, debug, alpha, overlap)
+c
+      implicit none
+      integer*8 nval_EM_p, nval_EM_S, nval_AC, ival1, ival2, ival3
+      integer*8 nel, npt, nnodes, nb_typ_el
+      integer*8 type_el(nel), debug
+      integer*8 table_nod(nnodes,nel)
+      double precision x(2,npt)
+      integer*8 nel_EM, el_convert_tbl(nel)
+      complex*16 soln_EM_p(3,nnodes,nval_EM_p,nel_EM)
+      complex*16 soln_EM_S(3,nnodes,nval_EM_S,nel_EM)
+      complex*16 soln_AC(3,nnodes,nval_AC,nel)
+      complex*16 Omega_AC(nval_AC), AC_mode_energy_elastic(nval_AC)
+      complex*16 alpha(nval_AC)
+      complex*16 overlap(nval_EM_S, nval_EM_p, nval_AC), beta_AC
+      complex*16 p_tensor(3,3,3,3,nb_typ_el)
+      complex*16 eta_tensor(3,3,3,3,nb_typ_el)
+      complex*16 eps_lst(nb_typ_el)
+
+c     Local variables
+      integer*8 nnodes0
+      parameter (nnodes0 = 6)
+      double precision xel(2,nnodes0)
+      complex*16 basis_overlap(3*nnodes0,3*nnodes0,3,3*nnodes0)
+      complex*16 basis_overlap_AC(3*nnodes0,3,3,3*nnodes0)
+      complex*16 E1star, E2, U, Ustar
+      integer*8 i, j, k, j1, typ_e
+      integer*8 iel, ind_ip, i_eq, iel_EM
+      integer*8 jtest, ind_jp, j_eq, k_eq
+      integer*8 ltest, ind_lp, l_eq
+      integer*8 itrial, ui, ival1s, ival2s, ival3s
+      integer*8 ival1_lo, ival1_hi, ival2_lo, ival2_hi
+      integer*8 ival3_lo, ival3_hi
+      complex*16 zt1, ii
+      double precision mat_B(2,2), mat_T(2,2), mat_T_tr(2,2)
+      double precision det_b, eps_0
+
+      double precision p2_p2(6,6), p2_p2x(6,6), p2_p2y(6,6)
+      double precision p2x_p2x(6,6), p2y_p2y(6,6), p2x_p2y(6,6)
+      double precision p2_p2_p2(6,6,6)
+      double precision p2_p2_p2x(6,6,6), p2_p2_p2y(6,6,6)
+C
+C
+Cf2py intent(in) nval_EM_p, nval_EM_S, nval_AC
+Cf2py intent(in) ival1, ival2, ival3, nb_typ_el
+Cf2py intent(in) nel, npt, nnodes, table_nod, p_tensor, eta_tensor
+Cf2py intent(in) beta_AC, Omega_AC, AC_mode_energy_elastic, debug
+Cf2py intent(in) type_el, x, soln_EM_p, soln_EM_S, soln_AC, eps_lst
+Cf2py intent(in) el_convert_tbl
+C
+Cf2py depend(table_nod) nnodes, nel
+Cf2py depend(type_el) npt
+Cf2py depend(x) npt
+Cf2py depend(el_convert_tbl) nel
+Cf2py depend(soln_EM_p) nnodes, nval_EM_p, nel_EM
+Cf2py depend(soln_EM_S) nnodes, nval_EM_S, nel_EM
+Cf2py depend(soln_AC) nnodes, nval_AC, nel
+Cf2py depend(p_tensor) nb_typ_el
+Cf2py depend(eta_tensor) nb_typ_el
+Cf2py depend(eps_lst) nb_typ_el
+Cf2py depend(Omega_AC) nval_AC
+Cf2py depend(AC_mode_energy_elastic) nval_AC
+C
+Cf2py intent(out) alpha, overlap
+C
+C Release the GIL while integrating (re-entrant, as declared recursive)
+Cf2py threadsafe
+C
+CCCCCCCCCCCCCCCCCCCCC Start Program CCCCCCCCCCCCCCCCCCCCCCCC
+C
+      ui = 6
+      eps_0 = 8.854187817d-12
+      ii = cmplx(0.0d0, 1.0d0)
+C
+      if ( nnodes .ne. 6 ) then
+        write(ui,*) "AC_alpha_photoelastic_int_v2: problem nnodes = ",
+     *              nnodes
+        write(ui,*) "AC_alpha_photoelastic_int_v2: ",
+     *              "nnodes should be equal to 6 !"
+        write(ui,*) "AC_alpha_photoelastic_int_v2: Aborting..."
+        stop
+      endif
+C
+C A mode index of -1 selects all modes of that type.
+      if (ival1 .eq. -1) then
+        ival1_lo = 1
+        ival1_hi = nval_EM_S
+      else
+        ival1_lo = ival1
+        ival1_hi = ival1
+      endif
+      if (ival2 .eq. -1) then
+        ival2_lo = 1
+        ival2_hi = nval_EM_p
+      else
+        ival2_lo = ival2
+        ival2_hi = ival2
+      endif
+      if (ival3 .eq. -1) then
+        ival3_lo = 1
+        ival3_hi = nval_AC
+      else
+        ival3_lo = ival3
+        ival3_hi = ival3
+      endif
+C photoelastic_int_v2 has no branch for one given and one -1 EM mode
+C with a given AC mode, and returns a zero overlap for these.
+C Empty the loop so that the results agree.
+      if (ival3 .ge. 0 .and. ((ival1 .eq. -1) .neqv. (ival2 .eq. -1)))
+     *  then
+        ival1_hi = ival1_lo - 1
+      endif
+cccccccccccc
+      do k=1,nval_AC
+        alpha(k) = 0.0d0
+      enddo
+      do i=1,nval_EM_S
+        do j=1,nval_EM_p
+          do k=1,nval_AC
+            overlap(i,j,k) = 0.0d0
+          enddo
+        enddo
+      enddo
+
+cccccccccccc
+C Loop over elements - start
+cccccccccccc
+      do iel=1,nel
+        iel_EM = el_convert_tbl(iel)
+        typ_e = type_el(iel)
+        do j=1,nnodes
+          j1 = table_nod(j,iel)
+          xel(1,j) = x(1,j1)
+          xel(2,j) = x(2,j1)
+        enddo
+cccccccccc
+c       The geometric transformation (x,y) -> (x_g,y_g) = mat_B*(x,y)^t + (x_0, y_0, z_0)^t
+c       maps the current triangle to the reference triangle.
+        do i=1,2
+          do j=1,2
+            mat_B(j,i) = xel(j,i+1) - xel(j,1)
+          enddo
+        enddo
+        det_b = mat_B(1,1) * mat_B(2,2) - mat_B(1,2) * mat_B(2,1)
+        if (abs(det_b) .le. 1.0d-22) then
+          write(*,*) '?? AC_alpha_PE_int_v2: Determinant = 0 :', det_b
+          write(*,*) "xel = ", xel
+          write(*,*) 'Aborting...'
+          stop
+        endif
+c       mat_T = inverse matrix of mat_B
+        mat_T(1,1) =  mat_B(2,2) / det_b
+        mat_T(2,2) =  mat_B(1,1) / det_b
+        mat_T(1,2) = -mat_B(1,2) / det_b
+        mat_T(2,1) = -mat_B(2,1) / det_b
+c       mat_T_tr = Transpose(mat_T)
+        mat_T_tr(1,1) = mat_T(1,1)
+        mat_T_tr(2,2) = mat_T(2,2)
+        mat_T_tr(1,2) = mat_T(2,1)
+        mat_T_tr(2,1) = mat_T(1,2)
+C
+        call mat_p2_p2 (p2_p2, det_b)
+        call mat_p2_p2x (p2_p2x, mat_T_tr, det_b)
+        call mat_p2_p2y (p2_p2y, mat_T_tr, det_b)
+        call mat_p2x_p2x (p2x_p2x, mat_T_tr, det_b)
+        call mat_p2x_p2y (p2x_p2y, mat_T_tr, det_b)
+        call mat_p2y_p2y (p2y_p2y, mat_T_tr, det_b)
+        call mat_p2_p2_p2 (p2_p2_p2, det_b)
+        call mat_p2_p2_p2x (p2_p2_p2x, mat_T_tr, det_b)
+        call mat_p2_p2_p2y (p2_p2_p2y, mat_T_tr, det_b)
+C
+cccccccccc
+C Acoustic loss: overlap of basis functions, see AC_alpha_int_v2
+        do itrial=1,nnodes0
+          do i_eq=1,3
+            ind_ip = i_eq + 3*(itrial-1)
+            do j_eq=1,3
+              do k_eq=1,3
+                do ltest=1,nnodes0
+                  do l_eq=1,3
+                    ind_lp = l_eq + 3*(ltest-1)
+c                   See Eq. (45) of C. Wolff et al. PRB (2015)
+                    if(j_eq == 1 .and. k_eq == 1) then
+                      zt1 = p2x_p2x(itrial,ltest)
+                    elseif(j_eq == 1 .and. k_eq == 2) then
+                      zt1 = p2x_p2y(itrial,ltest)
+                    elseif(j_eq == 1 .and. k_eq == 3) then
+                      zt1 = p2_p2x(ltest,itrial)
+                      zt1 = zt1 * (ii * beta_AC)
+                    elseif(j_eq == 2 .and. k_eq == 1) then
+                      zt1 = p2x_p2y(ltest,itrial)
+                    elseif(j_eq == 2 .and. k_eq == 2) then
+                      zt1 = p2y_p2y(itrial,ltest)
+                    elseif(j_eq == 2 .and. k_eq == 3) then
+                      zt1 = p2_p2y(ltest,itrial)
+                      zt1 = zt1 * (ii * beta_AC)
+                    elseif(j_eq == 3 .and. k_eq == 1) then
+                      zt1 = p2_p2x(itrial,ltest)
+                      zt1 = zt1 * (-ii * beta_AC)
+                    elseif(j_eq == 3 .and. k_eq == 2) then
+                      zt1 = p2_p2y(itrial,ltest)
+                      zt1 = zt1 * (-ii * beta_AC)
+                    else
+                      zt1 = p2_p2(itrial,ltest)
+                      zt1 = zt1 *  beta_AC**2
+                    endif
+                    basis_overlap_AC(ind_ip,j_eq,k_eq,ind_lp) =
+     *                eta_tensor(i_eq,j_eq,k_eq,l_eq,typ_e) * zt1
+                  enddo
+                enddo
+              enddo
+            enddo
+          enddo
+        enddo
+C
+cccccccccc
+C Photoelastic: overlap of basis functions, see photoelastic_int_v2
+        do itrial=1,nnodes0
+          do i_eq=1,3
+            ind_ip = i_eq + 3*(itrial-1)
+            do jtest=1,nnodes0
+              do j_eq=1,3
+                ind_jp = j_eq + 3*(jtest-1)
+                do k_eq=1,3
+                  do ltest=1,nnodes0
+                    do l_eq=1,3
+                      ind_lp = l_eq + 3*(ltest-1)
+                      if ( k_eq .eq. 1) then
+                        zt1 = p2_p2_p2x(itrial,jtest,ltest)
+                      elseif ( k_eq .eq. 2) then
+                        zt1 = p2_p2_p2y(itrial,jtest,ltest)
+                      else
+                        zt1 = p2_p2_p2(itrial,jtest,ltest)
+                        zt1 = zt1 * (-ii * beta_AC)
+                      endif
+                      zt1 = p_tensor(i_eq,j_eq,k_eq,l_eq,typ_e)
+     *                      * eps_lst(typ_e)**2 * zt1
+                      basis_overlap(ind_ip,ind_jp,k_eq,ind_lp) = zt1
+                    enddo
+                  enddo
+                enddo
+              enddo
+            enddo
+          enddo
+        enddo
+C
+cccccccccc
+C Having calculated overlap of basis functions on element
+C now multiply by specific field values for modes of interest.
+C
+C Acoustic loss of every AC mode.
+        do ival3s=1,nval_AC
+          do itrial=1,nnodes0
+            do i_eq=1,3
+              ind_ip = i_eq + 3*(itrial-1)
+              Ustar = conjg(soln_AC(i_eq,itrial,ival3s,iel))
+              do ltest=1,nnodes0
+                do l_eq=1,3
+                  ind_lp = l_eq + 3*(ltest-1)
+                  U = soln_AC(l_eq,ltest,ival3s,iel)
+                  do j_eq=1,3
+                    do k_eq=1,3
+                      zt1 = basis_overlap_AC(ind_ip,j_eq,k_eq,ind_lp)
+                      alpha(ival3s) = alpha(ival3s) + Ustar * U * zt1
+                    enddo
+                  enddo
+                enddo
+              enddo
+            enddo
+          enddo
+        enddo
+C
+C Photoelastic overlap of the selected EM and AC modes.
+        do itrial=1,nnodes0
+          do i_eq=1,3
+            ind_ip = i_eq + 3*(itrial-1)
+            do ival1s = ival1_lo,ival1_hi
+              E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel_EM))
+              do jtest=1,nnodes0
+                do j_eq=1,3
+                  ind_jp = j_eq + 3*(jtest-1)
+                  do ival2s = ival2_lo,ival2_hi
+                    E2 = soln_EM_p(j_eq,jtest,ival2s,iel_EM)
+                    do ltest=1,nnodes0
+                      do l_eq=1,3
+                        ind_lp = l_eq + 3*(ltest-1)
+                        do ival3s = ival3_lo,ival3_hi
+                          Ustar = conjg(soln_AC(l_eq,ltest,ival3s,iel))
+                          do k_eq=1,3
+                            zt1=basis_overlap(ind_ip,ind_jp,k_eq,ind_lp)
+                            zt1 = E1star * E2 * Ustar * zt1
+                            overlap(ival1s,ival2s,ival3s) = zt1 +
+     *                                  overlap(ival1s,ival2s,ival3s)
+                          enddo
+                        enddo
+                      enddo
+                    enddo
+                  enddo
+                enddo
+              enddo
+            enddo
+          enddo
+        enddo
+cccccccccccc
+C Loop over elements - end
+cccccccccccc
+      enddo
+C
+C Apply scaling that sits outside of integration.
+      do k=1,nval_AC
+C       Flipped sign as assuming did not do integration by parts - going off CW advice.
+        alpha(k) = Omega_AC(k)**2 / AC_mode_energy_elastic(k) * alpha(k)
+      enddo
+      do i=1,nval_EM_S
+        do j=1,nval_EM_p
+          do k=1,nval_AC
+            overlap(i,j,k) = overlap(i,j,k) * -1.0d0 * eps_0
+          enddo
+        enddo
+      enddo
+cccccccccccc
+      if(debug .eq. 1) then
+        write(*,*) "AC_alpha_PE_int_v2: alpha"
+        write(*,*) alpha
+        write(*,*) "AC_alpha_PE_int_v2: overlap"
+        write(*,*) overlap
+      endif
+C
+      end subroutine AC_alpha_photoelastic_int_v2
@@ -1,11 +1,11 @@
 c
 cccccccccccccccccccccccccccccccccccccccccccccccccc
 c
-      subroutine moving_boundary (nval_EM_p, nval_EM_S, nval_AC, ival1,
-     *    ival2, ival3, nel, npt, nnodes, table_nod, type_el, x,
-     *    nb_typ_el, typ_select_in, typ_select_out, 
+      recursive subroutine moving_boundary (nval_EM_p, nval_EM_S,
+     *    nval_AC, ival1, ival2, ival3, nel, npt, nnodes, table_nod,
+     *    type_el, x, nb_typ_el, typ_select_in, typ_select_out, 
      *    soln_EM_p, soln_EM_S, 
-     *    soln_AC, eps_lst, debug, overlap)
+     *    soln_AC, nel_EM, el_convert_tbl, eps_lst, debug, overlap)
 c
       implicit none
       integer*8 nel, npt, nnodes, nb_typ_el
@@ -15,8 +15,9 @@ c
       integer*8 nval_EM_p, nval_EM_S, nval_AC, ival1, ival2, ival3
       integer*8 ival3s, ival2s, ival1s
       integer*8 typ_select_in, typ_select_out
-      complex*16 soln_EM_p(3,nnodes,nval_EM_p,nel)
-      complex*16 soln_EM_S(3,nnodes,nval_EM_S,nel)
+      integer*8 nel_EM, el_convert_tbl(nel)
+      complex*16 soln_EM_p(3,nnodes,nval_EM_p,nel_EM)
+      complex*16 soln_EM_S(3,nnodes,nval_EM_S,nel_EM)
       complex*16 soln_AC(3,nnodes,nval_AC,nel)
       complex*16 eps_lst(nb_typ_el)
       complex*16 overlap(nval_EM_S, nval_EM_p, nval_AC)
@@ -26,7 +27,7 @@ c     Local variables
       integer*8 nb_visite(npt)
       integer*8 ls_edge_endpoint(2,npt)
       integer*8 edge_direction(npt)
-      integer*8 iel, inod, typ_e
+      integer*8 iel, inod, typ_e, iel_EM
       integer*8 inod_1, inod_2, inod_3, ls_inod(3)
       integer*8 j, j_1, j_2, j_3, i, k
       integer*8 nb_edges, nb_interface_edges
@@ -54,18 +55,23 @@ Cf2py intent(in) nval_EM_p, nval_EM_S, nval_AC
 Cf2py intent(in) ival1, ival2, ival3, nb_typ_el
 Cf2py intent(in) nel, npt, nnodes, table_nod, debug
 Cf2py intent(in) type_el, x, soln_EM_p, soln_EM_S, soln_AC
+Cf2py intent(in) el_convert_tbl
 Cf2py intent(in) typ_select_in, typ_select_out, eps_lst, debug
 C
 Cf2py depend(table_nod) nnodes, nel
 Cf2py depend(type_el) npt
 Cf2py depend(x) npt
-Cf2py depend(soln_EM_p) nnodes, nval_EM_p, nel
-Cf2py depend(soln_EM_S) nnodes, nval_EM_S, nel
+Cf2py depend(el_convert_tbl) nel
+Cf2py depend(soln_EM_p) nnodes, nval_EM_p, nel_EM
+Cf2py depend(soln_EM_S) nnodes, nval_EM_S, nel_EM
 Cf2py depend(soln_AC) nnodes, nval_AC, nel
 Cf2py depend(eps_lst) nb_typ_el
 C
 Cf2py intent(out) overlap
 C
+C Release the GIL while integrating (re-entrant, as declared recursive)
+Cf2py threadsafe
+C
 ccccccccccccccccccccccccccccccccccccc
 c
 c     typ_select_in: Only the elements iel with type_el(iel)=typ_select_in will be analysed
@@ -191,6 +197,7 @@ ccccccccccccccccccccccccccccccccccccc
 c
 c     Numerical integration
       do iel=1,nel
+        iel_EM = el_convert_tbl(iel)
         typ_e = type_el(iel)
         if(typ_e == typ_select_in) then
           eps_a = eps_lst(typ_e)
@@ -251,9 +258,9 @@ C If only want overlap of one given combination of EM modes and AC mode.
 c             Nodes of the edge
               do j_1=1,3
 c               (x,y,z)-components of the electric field
-                vec(1,1) = soln_EM_p(1,ls_inod(j_1),ival1,iel)
-                vec(2,1) = soln_EM_p(2,ls_inod(j_1),ival1,iel)
-                vec(3,1) = soln_EM_p(3,ls_inod(j_1),ival1,iel)
+                vec(1,1) = soln_EM_p(1,ls_inod(j_1),ival1,iel_EM)
+                vec(2,1) = soln_EM_p(2,ls_inod(j_1),ival1,iel_EM)
+                vec(3,1) = soln_EM_p(3,ls_inod(j_1),ival1,iel_EM)
 c               ls_n_dot(1): Normal component of vec(:,1)
                 ls_n_dot(1) = vec(1,1) * edge_perp(1)
      *              + vec(2,1) * edge_perp(2)
@@ -263,9 +270,9 @@ c               ls_n_dot(1): Normal component of vec(:,1)
      *              - vec(1,1) * edge_perp(2)
                 do j_2=1,3
 c                 (x,y,z)-components of the electric field
-                  vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2,iel)
-                  vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2,iel)
-                  vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2,iel)
+                  vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2,iel_EM)
+                  vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2,iel_EM)
+                  vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2,iel_EM)
 c                 ls_n_dot(2): Normal component of vec(:,2)
                   ls_n_dot(2) = vec(1,2) * edge_perp(1)
      *                + vec(2,2) * edge_perp(2)
@@ -303,9 +310,9 @@ C If want overlap of given EM mode 1 and 2 and all AC modes.
 c             Nodes of the edge
               do j_1=1,3
 c               (x,y,z)-components of the electric field
-                vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1,iel))
-                vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1,iel))
-                vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1,iel))
+                vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1,iel_EM))
+                vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1,iel_EM))
+                vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1,iel_EM))
 c               ls_n_dot(1): Normal component of vec(:,1)
                 ls_n_dot(1) = vec(1,1) * edge_perp(1)
      *              + vec(2,1) * edge_perp(2)
@@ -315,9 +322,9 @@ c               ls_n_dot(1): Normal component of vec(:,1)
      *              - vec(1,1) * edge_perp(2)
                 do j_2=1,3
 c                 (x,y,z)-components of the electric field
-                  vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2,iel)
-                  vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2,iel)
-                  vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2,iel)
+                  vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2,iel_EM)
+                  vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2,iel_EM)
+                  vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2,iel_EM)
 c                 ls_n_dot(2): Normal component of vec(:,2)
                   ls_n_dot(2) = vec(1,2) * edge_perp(1)
      *                + vec(2,2) * edge_perp(2)
@@ -357,9 +364,9 @@ C If want overlap of given EM mode 1 and all EM modes 2 and all AC modes.
 c             Nodes of the edge
               do j_1=1,3
 c               (x,y,z)-components of the electric field
-                vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1,iel))
-                vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1,iel))
-                vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1,iel))
+                vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1,iel_EM))
+                vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1,iel_EM))
+                vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1,iel_EM))
 c               ls_n_dot(1): Normal component of vec(:,1)
                 ls_n_dot(1) = vec(1,1) * edge_perp(1)
      *              + vec(2,1) * edge_perp(2)
@@ -370,9 +377,9 @@ c               ls_n_dot(1): Normal component of vec(:,1)
                 do ival2s = 1,nval_EM_p
                   do j_2=1,3
 c                   (x,y,z)-components of the electric field
-                    vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2s,iel)
-                    vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2s,iel)
-                    vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2s,iel)
+                    vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2s,iel_EM)
+                    vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2s,iel_EM)
+                    vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2s,iel_EM)
 c                   ls_n_dot(2): Normal component of vec(:,2)
                     ls_n_dot(2) = vec(1,2) * edge_perp(1)
      *                  + vec(2,2) * edge_perp(2)
@@ -414,9 +421,12 @@ c             Nodes of the edge
               do ival1s = 1,nval_EM_S
                 do j_1=1,3
 c                 (x,y,z)-components of the electric field
-                  vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1s,iel))
-                  vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1s,iel))
-                  vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1s,iel))
+                  vec(1,1) = conjg(
+     *              soln_EM_S(1,ls_inod(j_1),ival1s,iel_EM))
+                  vec(2,1) = conjg(
+     *              soln_EM_S(2,ls_inod(j_1),ival1s,iel_EM))
+                  vec(3,1) = conjg(
+     *              soln_EM_S(3,ls_inod(j_1),ival1s,iel_EM))
 c                 ls_n_dot(1): Normal component of vec(:,1)
                   ls_n_dot(1) = vec(1,1) * edge_perp(1)
      *                + vec(2,1) * edge_perp(2)
@@ -426,9 +436,9 @@ c                 ls_n_dot(1): Normal component of vec(:,1)
      *              - vec(1,1) * edge_perp(2)
                   do j_2=1,3
 c                   (x,y,z)-components of the electric field
-                    vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2,iel)
-                    vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2,iel)
-                    vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2,iel)
+                    vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2,iel_EM)
+                    vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2,iel_EM)
+                    vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2,iel_EM)
 c                   ls_n_dot(2): Normal component of vec(:,2)
                     ls_n_dot(2) = vec(1,2) * edge_perp(1)
      *                  + vec(2,2) * edge_perp(2)
@@ -470,9 +480,12 @@ c             Nodes of the edge
               do ival1s = 1,nval_EM_S
                 do j_1=1,3
 c                 (x,y,z)-components of the electric field
-                  vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1s,iel))
-                  vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1s,iel))
-                  vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1s,iel))
+                  vec(1,1) = conjg(
+     *              soln_EM_S(1,ls_inod(j_1),ival1s,iel_EM))
+                  vec(2,1) = conjg(
+     *              soln_EM_S(2,ls_inod(j_1),ival1s,iel_EM))
+                  vec(3,1) = conjg(
+     *              soln_EM_S(3,ls_inod(j_1),ival1s,iel_EM))
 c                 ls_n_dot(1): Normal component of vec(:,1)
                   ls_n_dot(1) = vec(1,1) * edge_perp(1)
      *                + vec(2,1) * edge_perp(2)
@@ -483,9 +496,9 @@ c                 ls_n_dot(1): Normal component of vec(:,1)
                   do ival2s = 1,nval_EM_p
                     do j_2=1,3
 c                     (x,y,z)-components of the electric field
-                      vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2s,iel)
-                      vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2s,iel)
-                      vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2s,iel)
+                      vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2s,iel_EM)
+                      vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2s,iel_EM)
+                      vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2s,iel_EM)
 c                     ls_n_dot(2): Normal component of vec(:,2)
                       ls_n_dot(2) = vec(1,2) * edge_perp(1)
      *                    + vec(2,2) * edge_perp(2)
@@ -528,9 +541,12 @@ c             Nodes of the edge
               do ival1s = 1,nval_EM_S
                 do j_1=1,3
 c                 (x,y,z)-components of the electric field
-                  vec(1,1) = conjg(soln_EM_S(1,ls_inod(j_1),ival1s,iel))
-                  vec(2,1) = conjg(soln_EM_S(2,ls_inod(j_1),ival1s,iel))
-                  vec(3,1) = conjg(soln_EM_S(3,ls_inod(j_1),ival1s,iel))
+                  vec(1,1) = conjg(
+     *              soln_EM_S(1,ls_inod(j_1),ival1s,iel_EM))
+                  vec(2,1) = conjg(
+     *              soln_EM_S(2,ls_inod(j_1),ival1s,iel_EM))
+                  vec(3,1) = conjg(
+     *              soln_EM_S(3,ls_inod(j_1),ival1s,iel_EM))
 c                 ls_n_dot(1): Normal component of vec(:,1)
                   ls_n_dot(1) = vec(1,1) * edge_perp(1)
      *                + vec(2,1) * edge_perp(2)
@@ -541,9 +557,9 @@ c                 ls_n_dot(1): Normal component of vec(:,1)
                   do ival2s = 1,nval_EM_p
                     do j_2=1,3
 c                     (x,y,z)-components of the electric field
-                      vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2s,iel)
-                      vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2s,iel)
-                      vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2s,iel)
+                      vec(1,2)=soln_EM_p(1,ls_inod(j_2),ival2s,iel_EM)
+                      vec(2,2)=soln_EM_p(2,ls_inod(j_2),ival2s,iel_EM)
+                      vec(3,2)=soln_EM_p(3,ls_inod(j_2),ival2s,iel_EM)
 c                     ls_n_dot(2): Normal component of vec(:,2)
                       ls_n_dot(2) = vec(1,2) * edge_perp(1)
      *                    + vec(2,2) * edge_perp(2)
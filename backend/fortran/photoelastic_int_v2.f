@@ -1,10 +1,10 @@
 C Calculate the overlap integral of two EM modes and an AC mode using
 C analytic expressions for basis function overlaps on linear elements.
 C
-      subroutine photoelastic_int_v2 (nval_EM_p, nval_EM_S, nval_AC, 
-     *  ival1, ival2, ival3, nel, npt, nnodes, table_nod, type_el, x,
-     *  nb_typ_el, p_tensor, beta_AC, soln_EM_p, soln_EM_S, soln_AC, 
-     *  eps_lst, debug, overlap)
+      recursive subroutine photoelastic_int_v2 (nval_EM_p, nval_EM_S,
+     *  nval_AC, ival1, ival2, ival3, nel, npt, nnodes, table_nod,
+     *  type_el, x, nb_typ_el, p_tensor, beta_AC, soln_EM_p, soln_EM_S,
+     *  soln_AC, nel_EM, el_convert_tbl, eps_lst, debug, overlap)
 c
       implicit none
       integer*8 nval_EM_p, nval_EM_S, nval_AC, ival1, ival2, ival3
@@ -13,8 +13,9 @@ c
       integer*8 table_nod(nnodes,nel)
       double precision x(2,npt)
 c      complex*16 x(2,npt)
-      complex*16 soln_EM_p(3,nnodes,nval_EM_p,nel)
-      complex*16 soln_EM_S(3,nnodes,nval_EM_S,nel)
+      integer*8 nel_EM, el_convert_tbl(nel)
+      complex*16 soln_EM_p(3,nnodes,nval_EM_p,nel_EM)
+      complex*16 soln_EM_S(3,nnodes,nval_EM_S,nel_EM)
       complex*16 soln_AC(3,nnodes,nval_AC,nel)
       complex*16 overlap(nval_EM_S, nval_EM_p, nval_AC), beta_AC
       complex*16 p_tensor(3,3,3,3,nb_typ_el)
@@ -26,7 +27,7 @@ c     Local variables
       complex*16 basis_overlap(3*nnodes0,3*nnodes0,3,3*nnodes0)
       complex*16 E1star, E2, Ustar
       integer*8 i, j, k, l, j1, typ_e
-      integer*8 iel, ind_ip, i_eq
+      integer*8 iel, ind_ip, i_eq, iel_EM
       integer*8 jtest, ind_jp, j_eq, k_eq
       integer*8 ltest, ind_lp, l_eq
       integer*8 itrial, ui, ival1s, ival2s, ival3s
@@ -54,18 +55,23 @@ Cf2py intent(in) nval_EM_p, nval_EM_S, nval_AC
 Cf2py intent(in) ival1, ival2, ival3, nb_typ_el
 Cf2py intent(in) nel, npt, nnodes, table_nod, p_tensor, beta_AC, debug
 Cf2py intent(in) type_el, x, soln_EM_p, soln_EM_S, soln_AC, eps_lst
+Cf2py intent(in) el_convert_tbl
 C
 Cf2py depend(table_nod) nnodes, nel
 Cf2py depend(type_el) npt
 Cf2py depend(x) npt
-Cf2py depend(soln_EM_p) nnodes, nval_EM_p, nel
-Cf2py depend(soln_EM_S) nnodes, nval_EM_S, nel
+Cf2py depend(el_convert_tbl) nel
+Cf2py depend(soln_EM_p) nnodes, nval_EM_p, nel_EM
+Cf2py depend(soln_EM_S) nnodes, nval_EM_S, nel_EM
 Cf2py depend(soln_AC) nnodes, nval_AC, nel
 Cf2py depend(p_tensor) nb_typ_el
 Cf2py depend(eps_lst) nb_typ_el
 C
 Cf2py intent(out) overlap
 C
+C Release the GIL while integrating (re-entrant, as declared recursive)
+Cf2py threadsafe
+C
 CCCCCCCCCCCCCCCCCCCCC Start Program CCCCCCCCCCCCCCCCCCCCCCCC
 C
       ui = 6
@@ -97,6 +103,7 @@ cccccccccccc
 C Loop over elements - start
 cccccccccccc
       do iel=1,nel
+        iel_EM = el_convert_tbl(iel)
         typ_e = type_el(iel)
         do j=1,nnodes
           j1 = table_nod(j,iel)
@@ -195,11 +202,11 @@ C If only want overlap of one given combination of EM modes and AC mode.
           do itrial=1,nnodes0
             do i_eq=1,3
               ind_ip = i_eq + 3*(itrial-1)
-              E1star = conjg(soln_EM_S(i_eq,itrial,ival1,iel))
+              E1star = conjg(soln_EM_S(i_eq,itrial,ival1,iel_EM))
               do jtest=1,nnodes0
                 do j_eq=1,3
                   ind_jp = j_eq + 3*(jtest-1)
-                  E2 = soln_EM_p(j_eq,jtest,ival2,iel)
+                  E2 = soln_EM_p(j_eq,jtest,ival2,iel_EM)
                   do ltest=1,nnodes0
                     do l_eq=1,3
                       ind_lp = l_eq + 3*(ltest-1)
@@ -223,11 +230,11 @@ C If want overlap of given EM mode 1 and 2 and all AC modes.
           do itrial=1,nnodes0
             do i_eq=1,3
               ind_ip = i_eq + 3*(itrial-1)
-              E1star = conjg(soln_EM_S(i_eq,itrial,ival1,iel))
+              E1star = conjg(soln_EM_S(i_eq,itrial,ival1,iel_EM))
               do jtest=1,nnodes0
                 do j_eq=1,3
                   ind_jp = j_eq + 3*(jtest-1)
-                  E2 = soln_EM_p(j_eq,jtest,ival2,iel)
+                  E2 = soln_EM_p(j_eq,jtest,ival2,iel_EM)
                   do ltest=1,nnodes0
                     do l_eq=1,3
                       ind_lp = l_eq + 3*(ltest-1)
@@ -253,12 +260,12 @@ C If want overlap of given EM mode 1 and all EM modes 2 and all AC modes.
           do itrial=1,nnodes0
             do i_eq=1,3
               ind_ip = i_eq + 3*(itrial-1)
-              E1star = conjg(soln_EM_S(i_eq,itrial,ival1,iel))
+              E1star = conjg(soln_EM_S(i_eq,itrial,ival1,iel_EM))
               do jtest=1,nnodes0
                 do j_eq=1,3
                   ind_jp = j_eq + 3*(jtest-1)
                   do ival2s = 1,nval_EM_p
-                    E2 = soln_EM_p(j_eq,jtest,ival2s,iel)
+                    E2 = soln_EM_p(j_eq,jtest,ival2s,iel_EM)
                     do ltest=1,nnodes0
                       do l_eq=1,3
                         ind_lp = l_eq + 3*(ltest-1)
@@ -286,11 +293,11 @@ C If want overlap of given EM mode 2 and all EM modes 1 and all AC modes.
             do i_eq=1,3
               ind_ip = i_eq + 3*(itrial-1)
               do ival1s = 1,nval_EM_S
-                E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel))
+                E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel_EM))
                 do jtest=1,nnodes0
                   do j_eq=1,3
                     ind_jp = j_eq + 3*(jtest-1)
-                    E2 = soln_EM_p(j_eq,jtest,ival2,iel)
+                    E2 = soln_EM_p(j_eq,jtest,ival2,iel_EM)
                     do ltest=1,nnodes0
                       do l_eq=1,3
                         ind_lp = l_eq + 3*(ltest-1)
@@ -318,12 +325,12 @@ C If want overlap of all EM mode 1, all EM modes 2 and all AC modes.
             do i_eq=1,3
               ind_ip = i_eq + 3*(itrial-1)
               do ival1s = 1,nval_EM_S
-                E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel))
+                E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel_EM))
                 do jtest=1,nnodes0
                   do j_eq=1,3
                     ind_jp = j_eq + 3*(jtest-1)
                     do ival2s = 1,nval_EM_p
-                    E2 = soln_EM_p(j_eq,jtest,ival2s,iel)
+                    E2 = soln_EM_p(j_eq,jtest,ival2s,iel_EM)
                     do ltest=1,nnodes0
                       do l_eq=1,3
                         ind_lp = l_eq + 3*(ltest-1)
@@ -352,12 +359,12 @@ C If want overlap of all EM mode 1, all EM modes 2 and one AC mode.
             do i_eq=1,3
               ind_ip = i_eq + 3*(itrial-1)
               do ival1s = 1,nval_EM_S
-                E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel))
+                E1star = conjg(soln_EM_S(i_eq,itrial,ival1s,iel_EM))
                 do jtest=1,nnodes0
                   do j_eq=1,3
                     ind_jp = j_eq + 3*(jtest-1)
                     do ival2s = 1,nval_EM_p
-                      E2 = soln_EM_p(j_eq,jtest,ival2s,iel)
+                      E2 = soln_EM_p(j_eq,jtest,ival2s,iel_EM)
                       do ltest=1,nnodes0
                         do l_eq=1,3
                           ind_lp = l_eq + 3*(ltest-1)
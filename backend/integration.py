@@ -20,14 +20,13 @@
 import time
 import numpy as np
 from scipy import interpolate
-import matplotlib
-matplotlib.use('pdf')
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
-# from mpl_toolkits.axes_grid1 import make_axes_locatable
 import csv
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
 
-import plotting
 from fortran import NumBAT
 
 
@@ -118,6 +117,9 @@ def gain_and_qs(sim_EM_pump, sim_EM_Stokes, sim_AC, k_AC,
     # ww weight function
     # coeff numerical integration
 
+    # The overlap routines for linear elements and moving_boundary release the GIL,
+    # so calls for independent k_AC / sim_AC may be run from separate threads.
+
 
     if EM_ival_pump == 'All':
         EM_ival_pump_fortran = -1
@@ -133,59 +135,84 @@ def gain_and_qs(sim_EM_pump, sim_EM_Stokes, sim_AC, k_AC,
         AC_ival_fortran = AC_ival+1  # convert back to Fortran indexing
 
     Fortran_debug = 0
-    ncomps = 3
     nnodes = 6
     num_modes_EM_pump = sim_EM_pump.num_modes
     num_modes_EM_Stokes = sim_EM_Stokes.num_modes
     num_modes_AC = sim_AC.num_modes
-    n_msh_el_AC = sim_AC.n_msh_el
-    trimmed_EM_pump_field = np.zeros((ncomps,nnodes,num_modes_EM_pump,n_msh_el_AC), dtype=complex)
-    trimmed_EM_Stokes_field = np.zeros((ncomps,nnodes,num_modes_EM_Stokes,n_msh_el_AC), dtype=complex)
-    for el in range(n_msh_el_AC):
-        new_el = sim_AC.el_convert_tbl[el]
-        for n in range(nnodes):
-            for x in range(ncomps):
-                for ival in range(num_modes_EM_pump):
-                    trimmed_EM_pump_field[x,n,ival,el] = sim_EM_pump.sol1[x,n,ival,new_el]
-                for ival in range(num_modes_EM_Stokes):
-                    trimmed_EM_Stokes_field[x,n,ival,el] = sim_EM_Stokes.sol1[x,n,ival,new_el]
-
-    # sim_EM_pump.sol1 = trimmed_EM_pump_field
-    # sim_EM_pump.n_msh_el = sim_AC.n_msh_el
-    # sim_EM_pump.n_msh_pts = sim_AC.n_msh_pts
-    # sim_EM_pump.type_el = sim_AC.type_el
-    # sim_EM_pump.table_nod = sim_AC.table_nod
-    # sim_EM_pump.x_arr = sim_AC.x_arr
-    # plotting.plt_mode_fields(sim_EM_pump, EM_AC='EM', prefix_str='int_test-', suffix_str='trim')
-
-    relevant_eps_effs =[]
-    for el_typ in range(sim_EM_pump.structure.nb_typ_el):
-        if el_typ+1 in sim_AC.typ_el_AC:
-            relevant_eps_effs.append(sim_EM_pump.n_list[el_typ]**2)
+    # The EM fields are passed on the full EM mesh; the Fortran routines look up
+    # the EM element underlying each AC element through el_convert_tbl.
+    el_convert_tbl = sim_AC.el_convert_tbl + 1  # convert to Fortran indexing
+
+    # f2py silently copies any array that is not Fortran-contiguous. The AC mesh
+    # arrays and material tensors are stored that way when created; the field
+    # arrays are checked once here rather than on every call.
+    table_nod = sim_AC.table_nod
+    type_el = sim_AC.type_el
+    x_arr = sim_AC.x_arr
+    sol_AC = np.asfortranarray(sim_AC.sol1)
+
+    # When a single EM mode is requested only that mode is handed to Fortran,
+    # and the results are placed back into the full sized arrays at the end.
+    # Note that ival1 (EM_ival_pump) selects the Stokes field and
+    # ival2 (EM_ival_Stokes) the pump field, except in moving_boundary when all
+    # three modes are given, which reads both from the pump field. The Fortran
+    # routines only evaluate that single combination anyway, so leave it be.
+    sel_S = slice(None)
+    sel_p = slice(None)
+    if 'All' in (EM_ival_pump, EM_ival_Stokes, AC_ival):
+        if EM_ival_pump != 'All':
+            sel_S = slice(EM_ival_pump, EM_ival_pump+1)
+            EM_ival_pump_fortran = 1
+        if EM_ival_Stokes != 'All':
+            sel_p = slice(EM_ival_Stokes, EM_ival_Stokes+1)
+            EM_ival_Stokes_fortran = 1
+    sol_EM_pump = np.asfortranarray(sim_EM_pump.sol1[:,:,sel_p,:])
+    sol_EM_Stokes = np.asfortranarray(sim_EM_Stokes.sol1[:,:,sel_S,:])
+    nval_EM_p = sol_EM_pump.shape[2]
+    nval_EM_S = sol_EM_Stokes.shape[2]
+
+    # Permittivities of the materials present in the AC mesh. These are fixed
+    # for a given structure, so cache them for reuse across a sweep in k_AC.
+    typ_el_key = tuple(sorted(sim_AC.typ_el_AC))
+    rel_eps_cache = sim_EM_pump.rel_eps_cache()
+    relevant_eps_effs = rel_eps_cache.get(typ_el_key)
+    if relevant_eps_effs is None:
+        nb_typ_el = sim_EM_pump.structure.nb_typ_el
+        keep_typ = np.isin(np.arange(1, nb_typ_el+1), typ_el_key)
+        relevant_eps_effs = np.ascontiguousarray(
+            np.asarray(sim_EM_pump.n_list[:nb_typ_el])[keep_typ]**2, dtype=complex)
+        rel_eps_cache[typ_el_key] = relevant_eps_effs
 
     print("\n-----------------------------------------------")
+    Q_PE = None
     if fixed_Q is None:
         # Calc alpha (loss) Eq. 45
         print("Acoustic loss calc")
         start = time.time()
         try:
             if sim_EM_pump.structure.inc_shape in sim_EM_pump.structure.linear_element_shapes:
-                alpha = NumBAT.ac_alpha_int_v2(sim_AC.num_modes,
-                    sim_AC.n_msh_el, sim_AC.n_msh_pts, nnodes,
-                    sim_AC.table_nod, sim_AC.type_el, sim_AC.x_arr,
-                    sim_AC.structure.nb_typ_el_AC, sim_AC.structure.eta_tensor,
-                    k_AC, sim_AC.Omega_AC, sim_AC.sol1,
-                    # sim_AC.AC_mode_power) # appropriate for alpha in [1/m]
-                    sim_AC.AC_mode_energy_elastic) # appropriate for alpha in [1/s]
+                # Q_photoelastic (Eq. 33) is accumulated in the same pass over the mesh
+                print("    with photoelastic calc")
+                alpha, Q_PE = NumBAT.ac_alpha_photoelastic_int_v2(
+                    nval_EM_p, nval_EM_S, sim_AC.num_modes, EM_ival_pump_fortran,
+                    EM_ival_Stokes_fortran, AC_ival_fortran, sim_AC.n_msh_el,
+                    sim_AC.n_msh_pts, nnodes,
+                    table_nod, type_el, x_arr,
+                    sim_AC.structure.nb_typ_el_AC, sim_AC.structure.p_tensor,
+                    sim_AC.structure.eta_tensor, k_AC, sim_AC.Omega_AC,
+                    sol_EM_pump, sol_EM_Stokes, sol_AC, el_convert_tbl,
+                    # sim_AC.AC_mode_power, # appropriate for alpha in [1/m]
+                    sim_AC.AC_mode_energy_elastic, # appropriate for alpha in [1/s]
+                    relevant_eps_effs, Fortran_debug)
             else:
                 if sim_EM_pump.structure.inc_shape not in sim_EM_pump.structure.curvilinear_element_shapes:
                     print("Warning: ac_alpha_int - not sure if mesh contains curvi-linear elements", 
                         "\n using slow quadrature integration by default.\n\n")
                 alpha = NumBAT.ac_alpha_int(sim_AC.num_modes,
                     sim_AC.n_msh_el, sim_AC.n_msh_pts, nnodes,
-                    sim_AC.table_nod, sim_AC.type_el, sim_AC.x_arr,
+                    table_nod, type_el, x_arr,
                     sim_AC.structure.nb_typ_el_AC, sim_AC.structure.eta_tensor,
-                    k_AC, sim_AC.Omega_AC, sim_AC.sol1,
+                    k_AC, sim_AC.Omega_AC, sol_AC,
                     # sim_AC.AC_mode_power, Fortran_debug) # appropriate for alpha in [1/m]
                     sim_AC.AC_mode_energy_elastic, Fortran_debug) # appropriate for alpha in [1/s]
         except KeyboardInterrupt:
@@ -207,34 +234,35 @@ def gain_and_qs(sim_EM_pump, sim_EM_Stokes, sim_AC, k_AC,
     linewidth_Hz = alpha/np.pi/2 # SBS linewidth of each resonance in [Hz]
 
     # Calc Q_photoelastic Eq. 33
-    print("Photoelastic calc")
-    start = time.time()
-    try:
-        if sim_EM_pump.structure.inc_shape in sim_EM_pump.structure.linear_element_shapes:
-            Q_PE = NumBAT.photoelastic_int_v2(
-                sim_EM_pump.num_modes, sim_EM_Stokes.num_modes, sim_AC.num_modes, EM_ival_pump_fortran,
-                EM_ival_Stokes_fortran, AC_ival_fortran, sim_AC.n_msh_el,
-                sim_AC.n_msh_pts, nnodes,
-                sim_AC.table_nod, sim_AC.type_el, sim_AC.x_arr,
-                sim_AC.structure.nb_typ_el_AC, sim_AC.structure.p_tensor,
-                k_AC, trimmed_EM_pump_field, trimmed_EM_Stokes_field, sim_AC.sol1,
-                relevant_eps_effs, Fortran_debug)
-        else:
-            if sim_EM_pump.structure.inc_shape not in sim_EM_pump.structure.curvilinear_element_shapes:
-                print("Warning: photoelastic_int - not sure if mesh contains curvi-linear elements", 
-                    "\n using slow quadrature integration by default.\n\n")
-            Q_PE = NumBAT.photoelastic_int(
-                sim_EM_pump.num_modes, sim_EM_Stokes.num_modes, sim_AC.num_modes, EM_ival_pump_fortran,
-                EM_ival_Stokes_fortran, AC_ival_fortran, sim_AC.n_msh_el,
-                sim_AC.n_msh_pts, nnodes,
-                sim_AC.table_nod, sim_AC.type_el, sim_AC.x_arr,
-                sim_AC.structure.nb_typ_el_AC, sim_AC.structure.p_tensor,
-                k_AC, trimmed_EM_pump_field, trimmed_EM_Stokes_field, sim_AC.sol1,
-                relevant_eps_effs, Fortran_debug)
-    except KeyboardInterrupt:
-        print("\n\n Routine photoelastic_int interrupted by keyboard.\n\n")
-    end = time.time()
-    print("     time (sec.)", (end - start))
+    if Q_PE is None:
+        print("Photoelastic calc")
+        start = time.time()
+        try:
+            if sim_EM_pump.structure.inc_shape in sim_EM_pump.structure.linear_element_shapes:
+                Q_PE = NumBAT.photoelastic_int_v2(
+                    nval_EM_p, nval_EM_S, sim_AC.num_modes, EM_ival_pump_fortran,
+                    EM_ival_Stokes_fortran, AC_ival_fortran, sim_AC.n_msh_el,
+                    sim_AC.n_msh_pts, nnodes,
+                    table_nod, type_el, x_arr,
+                    sim_AC.structure.nb_typ_el_AC, sim_AC.structure.p_tensor,
+                    k_AC, sol_EM_pump, sol_EM_Stokes, sol_AC, el_convert_tbl,
+                    relevant_eps_effs, Fortran_debug)
+            else:
+                if sim_EM_pump.structure.inc_shape not in sim_EM_pump.structure.curvilinear_element_shapes:
+                    print("Warning: photoelastic_int - not sure if mesh contains curvi-linear elements", 
+                        "\n using slow quadrature integration by default.\n\n")
+                Q_PE = NumBAT.photoelastic_int(
+                    nval_EM_p, nval_EM_S, sim_AC.num_modes, EM_ival_pump_fortran,
+                    EM_ival_Stokes_fortran, AC_ival_fortran, sim_AC.n_msh_el,
+                    sim_AC.n_msh_pts, nnodes,
+                    table_nod, type_el, x_arr,
+                    sim_AC.structure.nb_typ_el_AC, sim_AC.structure.p_tensor,
+                    k_AC, sol_EM_pump, sol_EM_Stokes, sol_AC, el_convert_tbl,
+                    relevant_eps_effs, Fortran_debug)
+        except KeyboardInterrupt:
+            print("\n\n Routine photoelastic_int interrupted by keyboard.\n\n")
+        end = time.time()
+        print("     time (sec.)", (end - start))
 
 
     # Calc Q_moving_boundary Eq. 41
@@ -244,13 +272,13 @@ def gain_and_qs(sim_EM_pump, sim_EM_Stokes, sim_AC, k_AC,
     print("Moving boundary calc")
     start = time.time()
     try:
-        Q_MB = NumBAT.moving_boundary(sim_EM_pump.num_modes, sim_EM_Stokes.num_modes,
+        Q_MB = NumBAT.moving_boundary(nval_EM_p, nval_EM_S,
             sim_AC.num_modes, EM_ival_pump_fortran, EM_ival_Stokes_fortran,
             AC_ival_fortran, sim_AC.n_msh_el,
-            sim_AC.n_msh_pts, nnodes, sim_AC.table_nod, 
-            sim_AC.type_el, sim_AC.x_arr,
+            sim_AC.n_msh_pts, nnodes, table_nod,
+            type_el, x_arr,
             sim_AC.structure.nb_typ_el_AC, typ_select_in, typ_select_out,
-            trimmed_EM_pump_field, trimmed_EM_Stokes_field, sim_AC.sol1,
+            sol_EM_pump, sol_EM_Stokes, sol_AC, el_convert_tbl,
             relevant_eps_effs, Fortran_debug)
     except KeyboardInterrupt:
         print("\n\n Routine moving_boundary interrupted by keyboard.\n\n")
@@ -262,26 +290,105 @@ def gain_and_qs(sim_EM_pump, sim_EM_Stokes, sim_AC, k_AC,
 
     # Note: sim_EM_pump.omega_EM is the optical angular freq in units of Hz
     # Note: sim_AC.Omega_AC is the acoustic angular freq in units of Hz
-    gain = 2*sim_EM_pump.omega_EM*sim_AC.Omega_AC*np.real(Q*np.conj(Q))
-    gain_PE = 2*sim_EM_pump.omega_EM*sim_AC.Omega_AC*np.real(Q_PE*np.conj(Q_PE))
-    gain_MB = 2*sim_EM_pump.omega_EM*sim_AC.Omega_AC*np.real(Q_MB*np.conj(Q_MB))
-    normal_fact = np.zeros((num_modes_EM_Stokes, num_modes_EM_pump, num_modes_AC), dtype=complex)
-    for i in range(num_modes_EM_Stokes):
-        P1 = sim_EM_Stokes.EM_mode_power[i]
-        for j in range(num_modes_EM_pump):
-            P2 = sim_EM_pump.EM_mode_power[j]
-            for k in range(num_modes_AC):
-                # P3 = sim_AC.AC_mode_power[k]
-                P3 = sim_AC.AC_mode_energy_elastic[k]
-                normal_fact[i, j, k] = P1*P2*P3*alpha[k]
+    gain_prefactor = 2*sim_EM_pump.omega_EM*sim_AC.Omega_AC
+    # |Q|^2 directly, without forming the complex conjugate product
+    gain = gain_prefactor*(Q.real**2 + Q.imag**2)
+    gain_PE = gain_prefactor*(Q_PE.real**2 + Q_PE.imag**2)
+    gain_MB = gain_prefactor*(Q_MB.real**2 + Q_MB.imag**2)
+    # normal_fact[i,j,k] = P1[i]*P2[j]*P3[k]*alpha[k], built as a broadcast outer product
+    P1 = np.asarray(sim_EM_Stokes.EM_mode_power)[sel_S]
+    P2 = np.asarray(sim_EM_pump.EM_mode_power)[sel_p]
+    # P3 = np.asarray(sim_AC.AC_mode_power)
+    P3 = np.asarray(sim_AC.AC_mode_energy_elastic)
+    normal_fact = (P1[:,None,None] * P2[None,:,None]
+                   * (P3*alpha)[None,None,:]).astype(complex)
     SBS_gain = np.real(gain/normal_fact)
     SBS_gain_PE = np.real(gain_PE/normal_fact)
     SBS_gain_MB = np.real(gain_MB/normal_fact)
 
+    if nval_EM_S != num_modes_EM_Stokes or nval_EM_p != num_modes_EM_pump:
+        full_shape = (num_modes_EM_Stokes, num_modes_EM_pump, num_modes_AC)
+        SBS_gains = []
+        for gain_sel in (SBS_gain, SBS_gain_PE, SBS_gain_MB):
+            gain_full = np.zeros(full_shape)
+            gain_full[sel_S, sel_p] = gain_sel
+            SBS_gains.append(gain_full)
+        SBS_gain, SBS_gain_PE, SBS_gain_MB = SBS_gains
+
     return SBS_gain, SBS_gain_PE, SBS_gain_MB, linewidth_Hz, Q_factors, alpha
 
 
 #### Categorise modes by their symmetries #############################################
+def _sym_metrics_numpy(m_Ex, m_Ey, valid_Ex, valid_Ey):
+    """ Summed deviation of the transverse fields from their y-mirror,
+        x-mirror and C_2 rotated images, over the grid points on the mesh.
+        Images that fall off the mesh count as a zero field.
+
+        Returns Ex_sigma_y, Ey_sigma_y, Ex_sigma_x, Ey_sigma_x, Ex_C_2, Ey_C_2.
+    """
+    m_Ex = np.ma.array(m_Ex, mask=~valid_Ex)
+    m_Ey = np.ma.array(m_Ey, mask=~valid_Ey)
+    f_Ex = m_Ex.filled(0)
+    f_Ey = m_Ey.filled(0)
+    return (np.sum(np.abs(m_Ex - f_Ex[:,::-1])),
+            np.sum(np.abs(m_Ey + f_Ey[:,::-1])),
+            np.sum(np.abs(m_Ex + f_Ex[::-1,:])),
+            np.sum(np.abs(m_Ey - f_Ey[::-1,:])),
+            np.sum(np.abs(m_Ex + f_Ex[::-1,::-1])),
+            np.sum(np.abs(m_Ey + f_Ey[::-1,::-1])))
+
+
+def _sym_metrics_loops(m_Ex, m_Ey, valid_Ex, valid_Ey):
+    """ Single pass version of ``_sym_metrics_numpy`` for compilation with numba.
+    """
+    n_pts_x, n_pts_y = m_Ex.shape
+    Ex_sigma_y = 0.0; Ey_sigma_y = 0.0
+    Ex_sigma_x = 0.0; Ey_sigma_x = 0.0
+    Ex_C_2 = 0.0; Ey_C_2 = 0.0
+    for ix in range(n_pts_x):
+        jx = n_pts_x-ix-1
+        for iy in range(n_pts_y):
+            jy = n_pts_y-iy-1
+            # an image point off the mesh counts as a zero field
+            if valid_Ex[ix,iy]:
+                Ex = m_Ex[ix,iy]
+                Ex_sigma_y += abs(Ex - (m_Ex[ix,jy] if valid_Ex[ix,jy] else 0))
+                Ex_sigma_x += abs(Ex + (m_Ex[jx,iy] if valid_Ex[jx,iy] else 0))
+                Ex_C_2 += abs(Ex + (m_Ex[jx,jy] if valid_Ex[jx,jy] else 0))
+            if valid_Ey[ix,iy]:
+                Ey = m_Ey[ix,iy]
+                Ey_sigma_y += abs(Ey + (m_Ey[ix,jy] if valid_Ey[ix,jy] else 0))
+                Ey_sigma_x += abs(Ey - (m_Ey[jx,iy] if valid_Ey[jx,iy] else 0))
+                Ey_C_2 += abs(Ey + (m_Ey[jx,jy] if valid_Ey[jx,jy] else 0))
+    return Ex_sigma_y, Ey_sigma_y, Ex_sigma_x, Ey_sigma_x, Ex_C_2, Ey_C_2
+
+
+def _interp_eval_numpy(verts, weights, v_E):
+    """ Linear interpolation of nodal values v_E onto points with precomputed
+        triangle vertices and barycentric weights.
+    """
+    return (weights*v_E[verts]).sum(axis=1)
+
+
+def _interp_eval_loops(verts, weights, v_E):
+    """ Loop version of ``_interp_eval_numpy`` for compilation with numba.
+    """
+    out = np.empty(verts.shape[0], dtype=v_E.dtype)
+    for k in prange(verts.shape[0]):
+        out[k] = (weights[k,0]*v_E[verts[k,0]] + weights[k,1]*v_E[verts[k,1]]
+                  + weights[k,2]*v_E[verts[k,2]])
+    return out
+
+
+# numba is optional: without it fall back to the numpy expressions.
+if njit is not None:
+    _sym_metrics = njit(cache=True)(_sym_metrics_loops)
+    _interp_eval = njit(parallel=True, cache=True, fastmath=True)(_interp_eval_loops)
+else:
+    _sym_metrics = _sym_metrics_numpy
+    _interp_eval = _interp_eval_numpy
+
+
 def symmetries(sim_wguide, n_points=10, negligible_threshold=1e-5):
     """ Plot EM mode fields.
 
@@ -293,129 +400,79 @@ def symmetries(sim_wguide, n_points=10, negligible_threshold=1e-5):
                 interpolate the field onto.
     """
 
+    # Imported here so that loading this module does not pull in matplotlib.
+    from matplotlib import tri
+
     mode_fields = sim_wguide.sol1
 
     # field mapping
-    x_tmp = []
-    y_tmp = []
-    for i in np.arange(sim_wguide.n_msh_pts):
-        x_tmp.append(sim_wguide.x_arr[0,i])
-        y_tmp.append(sim_wguide.x_arr[1,i])
-    x_min = np.min(x_tmp); x_max=np.max(x_tmp)
-    y_min = np.min(y_tmp); y_max=np.max(y_tmp)
+    x_min = sim_wguide.x_arr[0].min(); x_max = sim_wguide.x_arr[0].max()
+    y_min = sim_wguide.x_arr[1].min(); y_max = sim_wguide.x_arr[1].max()
     area = abs((x_max-x_min)*(y_max-y_min))
     n_pts_x = int(n_points*abs(x_max-x_min)/np.sqrt(area))
     n_pts_y = int(n_points*abs(y_max-y_min)/np.sqrt(area))
-    v_x=np.zeros(n_pts_x*n_pts_y)
-    v_y=np.zeros(n_pts_x*n_pts_y)
-    i=0
-    for x in np.linspace(x_min,x_max,n_pts_x):
-        for y in np.linspace(y_min,y_max,n_pts_y):
-            v_x[i] = x
-            v_y[i] = y
-            i+=1
-    v_x = np.array(v_x)
-    v_y = np.array(v_y)
+    xs = np.linspace(x_min,x_max,n_pts_x)
+    ys = np.linspace(y_min,y_max,n_pts_y)
+    m_x, m_y = np.meshgrid(xs, ys, indexing='ij')
+    v_x = m_x.ravel()
+    v_y = m_y.ravel()
 
     # unrolling data for the interpolators
     table_nod = sim_wguide.table_nod.T
     x_arr = sim_wguide.x_arr.T
 
+    # The geometry is the same for every mode, so build the
+    # triangulations and the finder once, outside the mode loop.
+    # dense triangulation with multiple points
+    # points are ordered element by element, node within element
+    i_ex = (table_nod[:, :6]-1).reshape(-1)
+    v_x6p = x_arr[i_ex, 0]
+    v_y6p = x_arr[i_ex, 1]
+    # each 6-node element is split into 4 linear sub-triangles
+    sub_triangles = np.array([[0,3,5],[1,4,3],[2,5,4],[3,4,5]], dtype=np.int32)
+    el_offsets = (6*np.arange(sim_wguide.n_msh_el, dtype=np.int32))[:,None,None]
+    v_triang6p = (sub_triangles[None,:,:] + el_offsets).reshape(-1,3)
+
+    # dense triangulation with unique points
+    v_triang1p = (table_nod[:,sub_triangles] - 1).reshape(-1,3)
+
+    # triang1p for the finder, v_triang6p for the values
+    triang1p = tri.Triangulation(x_arr[:,0],x_arr[:,1],v_triang1p)
+    finder = tri.TrapezoidMapTriFinder(triang1p)
+
+    # The grid points never move, so locate them and find their barycentric
+    # weights in the sub-triangles once. Each mode is then a gather and dot product.
+    tri_idx = finder(v_x, v_y)
+    valid = (tri_idx >= 0).reshape(n_pts_x,n_pts_y)
+    interp_verts = v_triang6p[np.where(tri_idx >= 0, tri_idx, 0)]
+    x0, x1, x2 = (v_x6p[interp_verts[:,k]] for k in range(3))
+    y0, y1, y2 = (v_y6p[interp_verts[:,k]] for k in range(3))
+    det_b = (y1-y2)*(x0-x2) + (x2-x1)*(y0-y2)
+    w0 = ((y1-y2)*(v_x-x2) + (x2-x1)*(v_y-y2))/det_b
+    w1 = ((y2-y0)*(v_x-x2) + (x0-x2)*(v_y-y2))/det_b
+    interp_weights = np.stack([w0, w1, 1-w0-w1], axis=1).astype(np.float32)
+    interp_weights[tri_idx < 0] = 0
+
     sym_list = []
 
     for ival in range(len(sim_wguide.Eig_values)):
-        # dense triangulation with multiple points
-        v_x6p = np.zeros(6*sim_wguide.n_msh_el)
-        v_y6p = np.zeros(6*sim_wguide.n_msh_el)
-        v_Ex6p = np.zeros(6*sim_wguide.n_msh_el, dtype=np.complex128)
-        v_Ey6p = np.zeros(6*sim_wguide.n_msh_el, dtype=np.complex128)
-        v_triang6p = []
-
-        i = 0
-        for i_el in np.arange(sim_wguide.n_msh_el):
-
-            # triangles
-            idx = np.arange(6*i_el, 6*(i_el+1))
-            triangles = [[idx[0], idx[3], idx[5]],
-                         [idx[1], idx[4], idx[3]],
-                         [idx[2], idx[5], idx[4]],
-                         [idx[3], idx[4], idx[5]]]
-            v_triang6p.extend(triangles)
-
-            for i_node in np.arange(6):
-                # index for the coordinates
-                i_ex = table_nod[i_el, i_node]-1
-                # values
-                v_x6p[i] = x_arr[i_ex, 0]
-                v_y6p[i] = x_arr[i_ex, 1]
-                v_Ex6p[i] = mode_fields[0,i_node,ival,i_el]
-                v_Ey6p[i] = mode_fields[1,i_node,ival,i_el]
-                i += 1
-
-        # dense triangulation with unique points
-        v_triang1p = []
-        for i_el in np.arange(sim_wguide.n_msh_el):
-            # triangles
-            triangles = [[table_nod[i_el,0]-1,table_nod[i_el,3]-1,table_nod[i_el,5]-1],
-                         [table_nod[i_el,1]-1,table_nod[i_el,4]-1,table_nod[i_el,3]-1],
-                         [table_nod[i_el,2]-1,table_nod[i_el,5]-1,table_nod[i_el,4]-1],
-                         [table_nod[i_el,3]-1,table_nod[i_el,4]-1,table_nod[i_el,5]-1]]
-            v_triang1p.extend(triangles)
-
-        # triangulations
-        triang6p = matplotlib.tri.Triangulation(v_x6p,v_y6p,v_triang6p)
-        triang1p = matplotlib.tri.Triangulation(x_arr[:,0],x_arr[:,1],v_triang1p)
-
-        # building interpolators: triang1p for the finder, triang6p for the values
-        finder = matplotlib.tri.TrapezoidMapTriFinder(triang1p)
-        ReEx = matplotlib.tri.LinearTriInterpolator(triang6p,v_Ex6p.real,trifinder=finder)
-        ImEx = matplotlib.tri.LinearTriInterpolator(triang6p,v_Ex6p.imag,trifinder=finder)
-        ReEy = matplotlib.tri.LinearTriInterpolator(triang6p,v_Ey6p.real,trifinder=finder)
-        ImEy = matplotlib.tri.LinearTriInterpolator(triang6p,v_Ey6p.imag,trifinder=finder)
-
-        ### plotting
+        # single precision is ample for the coarse symmetry thresholds below
+        v_Ex6p = mode_fields[0,:,ival,:].T.reshape(-1).astype(np.complex64)
+        v_Ey6p = mode_fields[1,:,ival,:].T.reshape(-1).astype(np.complex64)
+
         # interpolated fields
-        m_ReEx = ReEx(v_x,v_y).reshape(n_pts_x,n_pts_y)
-        m_ReEy = ReEy(v_x,v_y).reshape(n_pts_x,n_pts_y)
-        m_ImEx = ImEx(v_x,v_y).reshape(n_pts_x,n_pts_y)
-        m_ImEy = ImEy(v_x,v_y).reshape(n_pts_x,n_pts_y)
-        m_Ex = m_ReEx + 1j*m_ImEx
-        m_Ey = m_ReEy + 1j*m_ImEy
-
-        if np.max(np.abs(m_Ex[~np.isnan(m_Ex)])) < negligible_threshold:
-            m_Ex = np.zeros(np.shape(m_Ex))
-        if np.max(np.abs(m_Ey[~np.isnan(m_Ey)])) < negligible_threshold:
-            m_Ey = np.zeros(np.shape(m_Ey))
-
-
-        m_Ex_ymirror = np.zeros((n_pts_x,n_pts_y), dtype=np.complex128)
-        m_Ex_xmirror = np.zeros((n_pts_x,n_pts_y), dtype=np.complex128)
-        m_Ex_rotated = np.zeros((n_pts_x,n_pts_y), dtype=np.complex128)
-        m_Ey_ymirror = np.zeros((n_pts_x,n_pts_y), dtype=np.complex128)
-        m_Ey_xmirror = np.zeros((n_pts_x,n_pts_y), dtype=np.complex128)
-        m_Ey_rotated = np.zeros((n_pts_x,n_pts_y), dtype=np.complex128)
-        Ex_sigma_y = 0
-        Ey_sigma_y = 0
-        Ex_sigma_x = 0
-        Ey_sigma_x = 0
-        Ex_C_2 = 0
-        Ey_C_2 = 0
-
-        for ix in range(n_pts_x):
-            for iy in range(n_pts_y):
-                m_Ex_ymirror[ix,iy] = (m_Ex[ix,n_pts_y-iy-1])
-                m_Ey_ymirror[ix,iy] = -1*(m_Ey[ix,n_pts_y-iy-1])
-                m_Ex_xmirror[ix,iy] = -1*(m_Ex[n_pts_x-ix-1,iy])
-                m_Ey_xmirror[ix,iy] = (m_Ey[n_pts_x-ix-1,iy])
-                m_Ex_rotated[ix,iy] = -1*(m_Ex[n_pts_x-ix-1,n_pts_y-iy-1])
-                m_Ey_rotated[ix,iy] = -1*(m_Ey[n_pts_x-ix-1,n_pts_y-iy-1])
-
-        Ex_sigma_y = np.sum(np.abs(m_Ex - m_Ex_ymirror))
-        Ey_sigma_y = np.sum(np.abs(m_Ey - m_Ey_ymirror))
-        Ex_sigma_x = np.sum(np.abs(m_Ex - m_Ex_xmirror))
-        Ey_sigma_x = np.sum(np.abs(m_Ey - m_Ey_xmirror))
-        Ex_C_2 = np.sum(np.abs(m_Ex - m_Ex_rotated))
-        Ey_C_2 = np.sum(np.abs(m_Ey - m_Ey_rotated))
+        m_Ex = _interp_eval(interp_verts, interp_weights, v_Ex6p).reshape(n_pts_x,n_pts_y)
+        m_Ey = _interp_eval(interp_verts, interp_weights, v_Ey6p).reshape(n_pts_x,n_pts_y)
+
+        if np.max(np.abs(m_Ex[valid])) < negligible_threshold:
+            m_Ex = np.zeros(np.shape(m_Ex), dtype=np.complex64)
+        if np.max(np.abs(m_Ey[valid])) < negligible_threshold:
+            m_Ey = np.zeros(np.shape(m_Ey), dtype=np.complex64)
+
+        # compare fields with their mirrored (sigma) and rotated (C_2) images,
+        # summing over grid points on the mesh
+        Ex_sigma_y, Ey_sigma_y, Ex_sigma_x, Ey_sigma_x, Ex_C_2, Ey_C_2 = _sym_metrics(
+            m_Ex, m_Ey, valid, valid)
         sigma_y = (Ex_sigma_y + Ey_sigma_y)/(n_pts_x*n_pts_y)
         sigma_x = (Ex_sigma_x + Ey_sigma_x)/(n_pts_x*n_pts_y)
         C_2 = (Ex_C_2 + Ey_C_2)/(n_pts_x*n_pts_y)
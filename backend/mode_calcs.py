@@ -51,6 +51,30 @@ class Simmo(object):
         self.calc_AC_mode_power = calc_AC_mode_power
         self.debug = debug
 
+    def rel_eps_cache(self):
+        """ Cache of the permittivities of the materials kept on an AC mesh,
+        see integration.gain_and_qs.
+
+        Created on first use, so also available on sims saved before it existed.
+        """
+        return self.__dict__.setdefault('_rel_eps_cache', {})
+
+    @property
+    def el_convert_tbl(self):
+        """ Index of the EM mesh element underlying each element of the AC mesh.
+
+        Stored as a contiguous ``np.intp`` array so it can be used directly
+        for fancy indexing; assignments are re-cast by the setter.
+        """
+        if '_el_convert_tbl' not in self.__dict__ and 'el_convert_tbl' in self.__dict__:
+            # sims saved before this became a property hold it as a plain attribute
+            self.el_convert_tbl = self.__dict__.pop('el_convert_tbl')
+        return self._el_convert_tbl
+
+    @el_convert_tbl.setter
+    def el_convert_tbl(self, tbl):
+        self._el_convert_tbl = np.ascontiguousarray(tbl, dtype=np.intp)
+
     def calc_EM_modes(self):
         """ Run a Fortran FEM calculation to find the optical modes.
 
@@ -289,7 +313,7 @@ class Simmo(object):
             n_msh_pts_AC = 0
             type_el_AC = []
             table_nod_AC_tmp = np.zeros(np.shape(table_nod))
-            el_convert_tbl = {}
+            el_convert_tbl = []
             el_convert_tbl_inv = {}
             node_convert_tbl = {}
             if self.structure.plt_mesh:
@@ -300,7 +324,7 @@ class Simmo(object):
                 if type_el[el] in self.typ_el_AC:
                     # print "in", type_el[el]
                     type_el_AC.append(self.typ_el_AC[type_el[el]])
-                    el_convert_tbl[n_el_kept] = el
+                    el_convert_tbl.append(el)
                     el_convert_tbl_inv[el] = n_el_kept
                     for i in range(6):
                         # Leaves node numbering untouched
@@ -428,9 +452,11 @@ class Simmo(object):
         #     self.type_el = type_el_AC
         #     self.x_arr = x_arr_AC
         # else:
-        self.table_nod = table_nod_out
-        self.type_el = type_el_out
-        self.x_arr = x_arr_out
+        # Fixed for the lifetime of this mesh, so hold them Fortran-ordered
+        # for the repeated calls of the integration routines.
+        self.table_nod = np.asfortranarray(table_nod_out)
+        self.type_el = np.asfortranarray(type_el_out)
+        self.x_arr = np.asfortranarray(x_arr_out)
 
 ### Calc unnormalised power in each AC mode - PRA Eq. 18.
         if self.calc_AC_mode_power is True:
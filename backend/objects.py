@@ -610,8 +610,10 @@ class Struct(object):
         self.rho = rho
         self.c_tensor = c_tensor
         self.c_tensor_z = c_tensor_z
-        self.p_tensor = p_tensor
-        self.eta_tensor = eta_tensor
+        # Stored in the layout and type the Fortran integrals take,
+        # so f2py does not convert them on every call.
+        self.p_tensor = np.asfortranarray(p_tensor, dtype=complex)
+        self.eta_tensor = np.asfortranarray(eta_tensor, dtype=complex)
 
         self.linear_element_shapes = ['rectangular', 'slot', 'slot_coated', 'rib', 
                                       'rib_coated', 'rib_double_coated', 'pedestal']
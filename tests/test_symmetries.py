@@ -0,0 +1,102 @@
+"""
+    test_symmetries.py is a regression test for NumBAT.
+
+    Copyright (C) 2015  Bjorn Sturmberg, Kokou Dossou.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+"""
+Test the symmetry classification of mode fields on a mesh that does not
+fill its bounding box, so that some mirrored grid points fall off the mesh.
+"""
+
+import numpy as np
+import sys
+
+sys.path.append("../backend/")
+import integration
+
+from numpy.testing import assert_allclose as assert_ac
+from numpy.testing import assert_equal
+
+
+class Mesh_fields(object):
+    """ Stand-in for a ``Simmo`` object: P2 mesh of [-1,1]^2 with the
+        x>0, y>0 quadrant removed, carrying analytic transverse fields.
+    """
+    def __init__(self, n_cells=8):
+        nodes = {}
+        def node(x, y):
+            key = (round(x, 12), round(y, 12))
+            if key not in nodes:
+                nodes[key] = len(nodes)+1
+            return nodes[key]
+        def mid(p, q):
+            return ((p[0]+q[0])/2, (p[1]+q[1])/2)
+
+        h = 2./n_cells
+        elements = []
+        for i in range(n_cells):
+            for j in range(n_cells):
+                x0, y0 = -1+i*h, -1+j*h
+                if x0 >= 0 and y0 >= 0:
+                    continue
+                for a, b, c in [((x0,y0), (x0+h,y0), (x0+h,y0+h)),
+                                ((x0,y0), (x0+h,y0+h), (x0,y0+h))]:
+                    elements.append([node(*a), node(*b), node(*c),
+                        node(*mid(a,b)), node(*mid(b,c)), node(*mid(c,a))])
+
+        self.x_arr = np.zeros((2,len(nodes)))
+        for (x, y), i_node in nodes.items():
+            self.x_arr[:,i_node-1] = (x, y)
+        self.table_nod = np.array(elements).T
+        self.n_msh_el = self.table_nod.shape[1]
+        self.n_msh_pts = self.x_arr.shape[1]
+
+        x = self.x_arr[0,self.table_nod-1]
+        y = self.x_arr[1,self.table_nod-1]
+        g = np.exp(-2*(x**2 + y**2))
+        fields = [(g, 0*x), (x*g, y*g), (y*g, x*g), (x*y*g, g),
+                  (1j*x*g, y*y*g), ((x+0.3)*g, 0*x)]
+        self.Eig_values = np.arange(len(fields))
+        self.sol1 = np.zeros((3,6,len(fields),self.n_msh_el), dtype=complex)
+        for ival, (Ex, Ey) in enumerate(fields):
+            self.sol1[0,:,ival,:] = Ex
+            self.sol1[1,:,ival,:] = Ey
+
+
+sim_fields = Mesh_fields()
+
+# Mirrored grid points off the mesh count as a zero field.
+ref_sym_list = [[-1, 1, -1], [1, 1, 1], [1, -1, -1],
+                [-1, -1, 1], [1, -1, 1], [1, 1, -1]]
+
+
+def test_symmetries_non_convex_mesh():
+    for n_points in [10, 20]:
+        sym_list = integration.symmetries(sim_fields, n_points=n_points)
+        assert_equal(sym_list, ref_sym_list)
+
+
+def test_sym_metrics_loops_match_numpy():
+    rng = np.random.RandomState(0)
+    shape = (9, 7)
+    m_Ex = rng.normal(size=shape) + 1j*rng.normal(size=shape)
+    m_Ey = rng.normal(size=shape) + 1j*rng.normal(size=shape)
+    valid_Ex = rng.random_sample(shape) > 0.3
+    valid_Ey = rng.random_sample(shape) > 0.3
+    metrics_numpy = integration._sym_metrics_numpy(m_Ex, m_Ey, valid_Ex, valid_Ey)
+    metrics_loops = integration._sym_metrics_loops(m_Ex, m_Ey, valid_Ex, valid_Ey)
+    assert_ac(metrics_loops, metrics_numpy, rtol=1e-12)